@@ -9,13 +9,18 @@ Features:
 - Playlist (drag & drop, folder import, save/load JSON)
 - Keyboard shortcuts: Space=Play/Pause, Left/Right=Prev/Next, Up/Down=Volume
 - Video playback in pop-up window (VLC)
-- Uses pygame.mixer for audio playback, pydub for waveform samples
+- Uses pygame.mixer for audio playback, ffmpeg (optional pydub fallback) for the waveform envelope
 """
 
 import os
 import sys
 import json
+import hashlib
+import functools
 import random
+import subprocess
+import tempfile
+import time
 import numpy as np
 from pathlib import Path
 
@@ -24,8 +29,8 @@ from PyQt5.QtWidgets import (
     QApplication, QWidget, QPushButton, QHBoxLayout, QVBoxLayout, QListWidget,
     QFileDialog, QLabel, QSlider, QSizePolicy, QFrame, QMessageBox
 )
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QPainter, QColor, QBrush
+from PyQt5.QtCore import Qt, QTimer, QRect, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QBrush, QPixmap
 
 # Audio + processing
 try:
@@ -35,14 +40,24 @@ except Exception as e:
     raise
 try:
     from pydub import AudioSegment
-except Exception as e:
-    print("pydub is required. pip install pydub")
-    raise
+    _PYDUB_AVAILABLE = True
+except Exception:
+    _PYDUB_AVAILABLE = False
 try:
     import vlc
     _VLC_AVAILABLE = True
 except Exception:
     _VLC_AVAILABLE = False
+try:
+    import numba
+    _NUMBA_AVAILABLE = True
+except Exception:
+    _NUMBA_AVAILABLE = False
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except Exception:
+    _ORJSON_AVAILABLE = False
 
 # ------------------------
 # Constants / Window sizes
@@ -50,6 +65,238 @@ except Exception:
 WIN_WIDTH = 980
 WIN_HEIGHT = 360
 WAVE_HEIGHT = 100
+WAVE_SR = 22050 # decode rate for waveform samples (mono)
+ENV_PER_SEC = 200 # waveform envelope points per second of audio
+ENV_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "glmp")
+ENV_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_AUDIO_EXTS = frozenset({'.mp3','.wav','.ogg','.flac','.m4a'})
+_VIDEO_EXTS = frozenset({'.mp4','.mov','.mkv','.avi','.webm','.flv'})
+_MEDIA_EXTS = _AUDIO_EXTS | _VIDEO_EXTS
+_MEDIA_FILTER = "Media Files (" + " ".join("*" + e for e in sorted(_MEDIA_EXTS)) + ")"
+
+def _ext(path):
+    return os.path.splitext(path)[1].lower()
+
+# ------------------------
+# Time formatting
+# ------------------------
+@functools.lru_cache(maxsize=4096)
+def _fmt_secs(secs):
+    m, s = divmod(secs, 60)
+    return f"{m:02}:{s:02}"
+
+# ------------------------
+# Waveform decoding (ffmpeg)
+# ------------------------
+if _NUMBA_AVAILABLE:
+    # serial on purpose: decodes run on several QThreadPool threads at once and
+    # numba's default workqueue layer aborts on concurrent parallel calls
+    @numba.njit(fastmath=True, cache=True)
+    def _compute_envelope(raw, n_channels, block, out):
+        # channel mix + abs + block peak in a single pass over interleaved samples
+        n_blocks = out.shape[0]
+        for b in range(n_blocks):
+            s = b * block
+            e = s + block
+            peak = 0.0
+            for i in range(s, e, n_channels):
+                v = 0.0
+                for c in range(n_channels):
+                    v += abs(float(raw[i + c]))
+                v /= n_channels
+                if v > peak:
+                    peak = v
+            out[b] = peak
+
+def _block_peaks(samples, frames, channels=1):
+    # peak of the channel-mixed magnitude for every block of `frames` frames
+    block = frames * channels
+    n = len(samples) // block
+    if _NUMBA_AVAILABLE:
+        env = np.empty(n, dtype=np.float32)
+        _compute_envelope(samples, channels, block, env)
+    else:
+        blocks = np.abs(samples[:n*block].reshape(n, frames, channels).astype(np.float32, copy=False))
+        env = blocks.mean(axis=2).max(axis=1)
+    return env
+
+def _normalize_envelope(env):
+    mx = env.max() if env.size else 0.0
+    if mx > 0:
+        env /= mx
+    return env
+
+def _build_envelope(samples, sr, channels=1):
+    # block-peak reduction over interleaved samples held in memory
+    # returns (envelope normalized to 0..1, points per second)
+    frames = max(1, int(sr) // ENV_PER_SEC)
+    return _normalize_envelope(_block_peaks(samples, frames, channels)), sr / frames
+
+def _probe_duration(path):
+    # container duration from ffprobe; cheap, no decode
+    out = subprocess.check_output(
+        ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
+         '-of', 'default=noprint_wrappers=1:nokey=1', path],
+        stdin=subprocess.DEVNULL
+    )
+    return float(out.strip())
+
+def _stream_envelope(path, sr=WAVE_SR, duration=None):
+    # ffmpeg downmixes + resamples to s16le on a pipe; blocks are reduced as they
+    # arrive so only the envelope is kept, whatever the track length
+    # returns (envelope normalized to 0..1, points per second, duration in seconds)
+    if duration is None:
+        try:
+            duration = _probe_duration(path)
+        except (OSError, subprocess.CalledProcessError, ValueError):
+            duration = None # no ffprobe / no duration in container: count samples
+    frames = max(1, sr // ENV_PER_SEC)
+    chunk_bytes = 2 * frames * 4096
+    proc = subprocess.Popen(
+        ['ffmpeg', '-nostdin', '-v', 'quiet', '-i', path, '-f', 's16le', '-ar', str(sr), '-ac', '1', 'pipe:1'],
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, bufsize=1 << 20
+    )
+    parts = []
+    n_samples = 0
+    try:
+        while True:
+            chunk = proc.stdout.read(chunk_bytes)
+            if not chunk:
+                break
+            samples = np.frombuffer(chunk, dtype=np.int16, count=len(chunk) // 2)
+            n_samples += samples.size
+            parts.append(_block_peaks(samples, frames))
+    finally:
+        proc.stdout.close()
+        ret = proc.wait()
+    if ret != 0:
+        raise subprocess.CalledProcessError(ret, 'ffmpeg')
+    env = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+    if duration is None:
+        duration = n_samples / sr
+    return _normalize_envelope(env), sr / frames, duration
+
+# ------------------------
+# Envelope disk cache (LRU by atime)
+# ------------------------
+def _envelope_cache_path(path):
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_size}|{int(st.st_mtime)}"
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(ENV_CACHE_DIR, digest + ".npy")
+
+def _load_cached_envelope(cachepath):
+    # layout: [env_rate, duration, envelope...] as float32
+    data = np.load(cachepath, mmap_mode='r')
+    os.utime(cachepath) # bump atime for LRU even on noatime mounts
+    return data[2:], float(data[0]), float(data[1])
+
+def _save_cached_envelope(cachepath, env, rate, duration):
+    os.makedirs(ENV_CACHE_DIR, exist_ok=True)
+    data = np.concatenate((np.array([rate, duration], dtype=np.float32), env.astype(np.float32)))
+    # unique temp name so concurrent decodes of the same track don't collide
+    fd, tmp = tempfile.mkstemp(dir=ENV_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, data)
+        os.replace(tmp, cachepath)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _prune_envelope_cache()
+
+def _prune_envelope_cache():
+    entries = []
+    total = 0
+    stale = time.time() - 3600
+    with os.scandir(ENV_CACHE_DIR) as it:
+        for e in it:
+            if e.name.endswith(".npy"):
+                st = e.stat()
+                entries.append((st.st_atime, st.st_size, e.path))
+                total += st.st_size
+            elif e.name.endswith(".tmp"):
+                # leftovers from interrupted writes; recent ones may still be in progress
+                try:
+                    if e.stat().st_mtime < stale:
+                        os.unlink(e.path)
+                except OSError:
+                    pass
+    entries.sort()
+    for _, size, p in entries:
+        if total <= ENV_CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(p)
+            total -= size
+        except OSError:
+            pass
+
+def _decode_envelope(path, duration=None):
+    # returns (envelope, envelope points per second, duration in seconds)
+    try:
+        cachepath = _envelope_cache_path(path)
+    except OSError:
+        cachepath = None
+    if cachepath is not None and os.path.exists(cachepath):
+        try:
+            return _load_cached_envelope(cachepath)
+        except Exception:
+            pass # unreadable entry, decode again and overwrite it
+
+    try:
+        env, rate, duration = _stream_envelope(path, duration=duration)
+    except OSError:
+        # ffmpeg not on PATH -> fall back to pydub (handles WAV on its own)
+        if not _PYDUB_AVAILABLE:
+            raise
+        aud = AudioSegment.from_file(path)
+        duration = len(aud) / 1000.0
+        # zero-copy view of the interleaved PCM; the envelope builder mixes
+        # channels itself and normalizes, so no float copy is needed
+        dtype = {1: np.int8, 2: np.int16}.get(aud.sample_width, np.int32)
+        samples = np.frombuffer(aud.raw_data, dtype=dtype)
+        env, rate = _build_envelope(samples, aud.frame_rate, aud.channels)
+    if cachepath is not None:
+        try:
+            _save_cached_envelope(cachepath, env, rate, duration)
+        except OSError:
+            pass
+    return env, rate, duration
+
+# ------------------------
+# Background decode (QThreadPool)
+# ------------------------
+class _DecodeSignals(QObject):
+    # request id, duration -- sent as soon as ffprobe answers
+    probed = pyqtSignal(int, float)
+    # request id, envelope (or None), duration
+    decoded = pyqtSignal(int, object, float)
+
+class DecodeWorker(QRunnable):
+    def __init__(self, request_id, path, on_decoded, on_probed):
+        super().__init__()
+        self.request_id = request_id
+        self.path = path
+        self.signals = _DecodeSignals()
+        self.signals.probed.connect(on_probed)
+        self.signals.decoded.connect(on_decoded)
+
+    def run(self):
+        # duration first so labels and seeking work while the envelope is built
+        try:
+            duration = _probe_duration(self.path)
+            self.signals.probed.emit(self.request_id, duration)
+        except Exception:
+            duration = None
+        try:
+            env, _, duration = _decode_envelope(self.path, duration)
+        except Exception:
+            env, duration = None, 0.0
+        self.signals.decoded.emit(self.request_id, env, duration)
 
 # ------------------------
 # Video pop-up window (VLC)
@@ -104,35 +351,67 @@ class VideoWindow(QWidget):
 # ------------------------
 class AudioBackend:
     def __init__(self):
-        pygame.mixer.init()
-        pygame.mixer.music.set_volume(0.7)
+        # mixer is opened lazily on first load(); an idle mixer keeps the audio device busy
+        self._initialized = False
+        self._volume = 0.7
+        # get_pos() counts from the last play(), so remember where that was
+        self._offset_ms = 0
+
+    def _ensure_init(self):
+        if not self._initialized:
+            # larger buffer than pygame's default avoids xruns/popping (PipeWire/Pulse)
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=4096)
+            pygame.mixer.music.set_volume(self._volume)
+            self._initialized = True
 
     def load(self, path):
+        self._ensure_init()
         pygame.mixer.music.load(path)
 
     def play(self, start_pos=0.0):
+        self._ensure_init()
         pygame.mixer.music.stop()
         try:
             # some pygame builds accept start param
             pygame.mixer.music.play(0, start_pos)
+            self._offset_ms = int(start_pos * 1000)
         except TypeError:
             # fallback: play from start (approx)
             pygame.mixer.music.play()
+            self._offset_ms = 0
+
+    def set_pos(self, pos):
+        # in-place seek, no stop/reload; raises pygame.error where unsupported
+        if not self._initialized:
+            raise pygame.error("mixer not initialized")
+        played = pygame.mixer.music.get_pos()
+        pygame.mixer.music.set_pos(pos)
+        self._offset_ms = int(pos * 1000) - max(0, played)
 
     def pause(self):
-        pygame.mixer.music.pause()
+        if self._initialized:
+            pygame.mixer.music.pause()
 
     def unpause(self):
-        pygame.mixer.music.unpause()
+        if self._initialized:
+            pygame.mixer.music.unpause()
 
     def stop(self):
-        pygame.mixer.music.stop()
+        if self._initialized:
+            pygame.mixer.music.stop()
 
     def set_volume(self, value):
-        pygame.mixer.music.set_volume(value)
+        self._volume = value
+        if self._initialized:
+            pygame.mixer.music.set_volume(value)
 
     def get_pos_ms(self):
-        return pygame.mixer.music.get_pos()
+        if not self._initialized:
+            return -1
+        pos = pygame.mixer.music.get_pos()
+        if pos < 0:
+            return pos
+        return pos + self._offset_ms
 
 # ------------------------
 # Waveform Widget
@@ -143,41 +422,94 @@ class WaveformWidget(QFrame):
         self.setMinimumHeight(WAVE_HEIGHT)
         self.setMaximumHeight(WAVE_HEIGHT)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        self.amplitudes = np.zeros(200)
+        self._brush = QBrush(QColor(0,255,0))
+        # whole-track view: envelope rendered once, playhead drawn on top
+        self._full_env = None
+        self._track_pixmap = None
+        self._playhead_x = -1
         self.setStyleSheet("background-color: #000000; border-top: 1px solid #003300;")
 
-    def set_amplitudes(self, arr):
-        if arr is None:
-            self.amplitudes = np.zeros(200)
+    @staticmethod
+    def _peaks(arr, n):
+        absarr = np.abs(arr)
+        if absarr.size <= n:
+            # stretch short windows by repeating points (no interpolation)
+            amps = absarr[np.arange(n) * absarr.size // n]
         else:
-            arr = np.asarray(arr)
-            if arr.size == 0:
-                self.amplitudes = np.zeros(200)
-            else:
-                self.amplitudes = np.interp(
-                    np.linspace(0, arr.size-1, 200),
-                    np.arange(arr.size),
-                    np.abs(arr)
-                )
-                mx = max(self.amplitudes.max(), 1e-9)
-                self.amplitudes = self.amplitudes / mx
+            # peak of each block keeps transients visible
+            idx = np.unique(np.linspace(0, absarr.size, n+1, dtype=np.int64))
+            amps = np.maximum.reduceat(absarr, idx[:-1])
+        mx = amps.max()
+        if mx >= 1e-9:
+            amps = amps / mx
+        return amps
+
+    @staticmethod
+    def _bar_rects(amps, w, h):
+        n = len(amps)
+        bar_w = max(1, w / n)
+        # build all bars up front so they go to Qt in one drawRects call
+        xs = (np.arange(n) * bar_w).astype(np.int32)
+        heights = (np.asarray(amps) * h).astype(np.int32)
+        ys = h - heights
+        bw = int(bar_w*0.9)
+        return [QRect(int(xs[i]), int(ys[i]), bw, int(heights[i]))
+                for i in np.flatnonzero(heights > 0)]
+
+    def set_full_envelope(self, env):
+        self._full_env = None if env is None or len(env) == 0 else env
+        self._playhead_x = -1
+        self._rebuild_pixmap()
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.fillRect(self.rect(), QColor(0,0,0))
+    def set_progress(self, frac):
+        if self._track_pixmap is None:
+            return
+        x = int(min(max(frac, 0.0), 1.0) * (self.width() - 1))
+        if x == self._playhead_x:
+            return
+        h = self.height()
+        # only the old and new playhead columns need repainting
+        if self._playhead_x >= 0:
+            self.update(QRect(self._playhead_x, 0, 1, h))
+        self._playhead_x = x
+        self.update(QRect(x, 0, 1, h))
+
+    def _rebuild_pixmap(self):
         w = self.width()
         h = self.height()
-        n = len(self.amplitudes)
-        if n == 0:
+        if self._full_env is None or w <= 0 or h <= 0:
+            self._track_pixmap = None
             return
-        bar_w = max(1, w / n)
-        brush = QBrush(QColor(0,255,0))
-        painter.setBrush(brush)
-        for i, v in enumerate(self.amplitudes):
-            x = int(i * bar_w)
-            bar_h = int(v * h)
-            painter.drawRect(x, h - bar_h, int(bar_w*0.9), bar_h)
+        pixmap = QPixmap(w, h)
+        pixmap.fill(QColor(0,0,0))
+        rects = self._bar_rects(self._peaks(self._full_env, max(1, w // 3)), w, h)
+        if rects:
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self._brush)
+            painter.drawRects(rects)
+            painter.end()
+        self._track_pixmap = pixmap
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._full_env is not None:
+            self._rebuild_pixmap()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        r = event.rect()
+        if self._track_pixmap is None:
+            painter.fillRect(r, QColor(0,0,0))
+            return
+        # bars live in the cached pixmap; only the exposed part is blitted
+        painter.drawPixmap(r, self._track_pixmap, r)
+        if self._playhead_x >= 0:
+            painter.setPen(QColor(0,255,0))
+            painter.drawLine(self._playhead_x, 0, self._playhead_x, self.height())
 
 # ------------------------
 # Main UI
@@ -200,6 +532,9 @@ class GhostPlayerUI(QWidget):
         """)
         # backend
         self.backend = AudioBackend()
+        # collapse a burst of slider drags into one seek every 80 ms
+        self._seek_timer = QTimer(singleShot=True)
+        self._seek_timer.setInterval(80)
         # UI build
         self._build_ui()
         self._connect_signals()
@@ -207,13 +542,19 @@ class GhostPlayerUI(QWidget):
         # state
         self.current_file = None
         self.track_duration = 0.0
-        self.samples = None
+        self.envelope = None
+        self._decode_id = 0
+        self._last_elapsed_s = -1
+        self._last_remaining_s = -1
         self.timer = QTimer()
         self.timer.setInterval(300)
         self.timer.timeout.connect(self._update_time_and_visual)
         self.repeat_mode = 'none' # none, one, all
         self.shuffle = False
+        self._shuffle_order = []
+        self._shuffle_pos = 0
         self.video_win = None
+        self._state = 'stopped' # playing, paused, stopped
 
         self.setFocusPolicy(Qt.StrongFocus)
 
@@ -306,7 +647,13 @@ class GhostPlayerUI(QWidget):
         self.load_playlist_btn.clicked.connect(self.load_playlist)
         self.playlist.itemDoubleClicked.connect(self.play_selected)
         self.scrub_slider.sliderReleased.connect(self.seek_from_slider)
+        self.scrub_slider.sliderMoved.connect(self._on_slider_moved)
+        self._seek_timer.timeout.connect(self._do_seek)
         self.volume_slider.valueChanged.connect(self.change_volume)
+        model = self.playlist.model()
+        model.rowsInserted.connect(self._on_playlist_changed)
+        model.rowsRemoved.connect(self._on_playlist_changed)
+        model.modelReset.connect(self._on_playlist_changed)
 
     # Drag & drop events
     def dragEnterEvent(self, event):
@@ -314,27 +661,55 @@ class GhostPlayerUI(QWidget):
             event.acceptProposedAction()
 
     def dropEvent(self, event):
+        paths = []
         for url in event.mimeData().urls():
             path = url.toLocalFile()
             if os.path.isdir(path):
-                self._add_folder_to_playlist(path)
+                paths.extend(self._scan_folder(path))
             else:
-                if path.lower().endswith(('.mp3','.wav','.ogg','.flac','.m4a','.mp4','.mov','.mkv','.avi','.webm')):
-                    self.playlist.addItem(path)
+                if _ext(path) in _MEDIA_EXTS:
+                    paths.append(path)
+        self._add_paths(paths)
 
     # Playlist ops
     def load_file(self):
-        file, _ = QFileDialog.getOpenFileName(self, "Select audio/video", "", "Media Files (*.mp3 *.wav *.ogg *.flac *.m4a *.mp4 *.mov *.mkv *.avi *.webm)")
+        file, _ = QFileDialog.getOpenFileName(self, "Select audio/video", "", _MEDIA_FILTER)
         if file:
             self.playlist.addItem(file)
             self.playlist.setCurrentRow(self.playlist.count()-1)
             self.play()
 
+    def _add_paths(self, paths):
+        # one model update + one repaint for the whole batch
+        if not paths:
+            return
+        self.playlist.setUpdatesEnabled(False)
+        try:
+            self.playlist.addItems(paths)
+        finally:
+            self.playlist.setUpdatesEnabled(True)
+
+    def _scan_folder(self, folder):
+        paths = []
+        stack = [folder]
+        while stack:
+            d = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif _ext(entry.name) in _MEDIA_EXTS:
+                            paths.append(entry.path)
+            except OSError:
+                continue
+            # reversed so the first listed subfolder is popped first (os.walk order)
+            stack.extend(reversed(subdirs))
+        return paths
+
     def _add_folder_to_playlist(self, folder):
-        for root, _, files in os.walk(folder):
-            for f in files:
-                if f.lower().endswith(('.mp3','.wav','.ogg','.flac','.m4a','.mp4','.mov','.mkv','.avi','.webm')):
-                    self.playlist.addItem(os.path.join(root, f))
+        self._add_paths(self._scan_folder(folder))
 
     def load_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Select folder")
@@ -348,17 +723,21 @@ class GhostPlayerUI(QWidget):
             return
         file, _ = QFileDialog.getSaveFileName(self, "Save playlist", "playlist.json", "JSON Files (*.json)")
         if file:
-            with open(file, 'w', encoding='utf-8') as f:
-                json.dump(items, f)
+            if _ORJSON_AVAILABLE:
+                data = orjson.dumps(items)
+            else:
+                data = json.dumps(items).encode('utf-8')
+            with open(file, 'wb') as f:
+                f.write(data)
 
     def load_playlist(self):
         file, _ = QFileDialog.getOpenFileName(self, "Load playlist", "", "JSON Files (*.json)")
         if file:
-            with open(file, 'r', encoding='utf-8') as f:
-                items = json.load(f)
+            with open(file, 'rb') as f:
+                data = f.read()
+            items = orjson.loads(data) if _ORJSON_AVAILABLE else json.loads(data)
             self.playlist.clear()
-            for it in items:
-                self.playlist.addItem(it)
+            self._add_paths(items)
 
     # Playback control
     def play_selected(self, item):
@@ -369,18 +748,35 @@ class GhostPlayerUI(QWidget):
     def _prepare_track(self, path):
         self.current_file = path
         self.title_label.setText(os.path.basename(path))
-        try:
-            aud = AudioSegment.from_file(path)
-            self.track_duration = len(aud) / 1000.0
-            samples = np.array(aud.get_array_of_samples()).astype(np.float32)
-            if aud.channels > 1:
-                samples = samples.reshape((-1, aud.channels)).mean(axis=1)
-            max_val = float(1 << (8*aud.sample_width - 1))
-            samples = samples / max_val
-            self.samples = samples
-        except Exception:
-            self.track_duration = 0.0
-            self.samples = None
+        self.track_duration = 0.0
+        self.envelope = None
+        self.waveform.set_full_envelope(None)
+        # don't leave the previous track's time on screen while decoding
+        self.elapsed_label.setText("00:00")
+        self.remaining_label.setText("-00:00")
+        self._last_elapsed_s = -1
+        self._last_remaining_s = -1
+        self.scrub_slider.blockSignals(True)
+        self.scrub_slider.setValue(0)
+        self.scrub_slider.blockSignals(False)
+        # decode off the GUI thread; replies for older tracks get dropped
+        self._decode_id += 1
+        QThreadPool.globalInstance().start(
+            DecodeWorker(self._decode_id, path, self._on_decoded, self._on_probed)
+        )
+
+    def _on_probed(self, request_id, duration):
+        if request_id != self._decode_id:
+            return
+        self.track_duration = duration
+
+    def _on_decoded(self, request_id, envelope, duration):
+        if request_id != self._decode_id:
+            return
+        self.envelope = envelope
+        if duration > 0:
+            self.track_duration = duration
+        self.waveform.set_full_envelope(envelope)
 
     def play(self):
         item = self.playlist.currentItem()
@@ -392,7 +788,7 @@ class GhostPlayerUI(QWidget):
                 return
         path = item.text()
         # if it's a video, pop-up VLC window
-        if path.lower().endswith(('.mp4','.mov','.mkv','.avi','.webm','.flv')) and _VLC_AVAILABLE:
+        if _ext(path) in _VIDEO_EXTS and _VLC_AVAILABLE:
             try:
                 self.video_win = VideoWindow(path, parent=self)
                 try:
@@ -403,30 +799,38 @@ class GhostPlayerUI(QWidget):
                 QMessageBox.critical(self, "Video Error", f"Video playback failed: {e}")
             return
 
-        # audio file path
-        try:
-            self._prepare_track(path)
-        except Exception:
-            pass
-
+        # audio file path: start playback first, waveform follows once decoded
         try:
             self.backend.load(path)
             self.backend.play(0.0)
             self.backend.set_volume(self.volume_slider.value()/100.0)
             self.timer.start()
+            self._state = 'playing'
         except Exception as e:
             QMessageBox.critical(self, "Playback Error", f"Unable to play file:\n{e}")
 
+        try:
+            self._prepare_track(path)
+        except Exception:
+            pass
+
     def pause(self):
         self.backend.pause()
         self.timer.stop()
+        if self._state == 'playing':
+            self._state = 'paused'
 
     def stop(self):
         self.backend.stop()
         self.timer.stop()
+        self._state = 'stopped'
+        # a decode still in flight must not repaint the cleared waveform
+        self._decode_id += 1
         self.elapsed_label.setText("00:00")
         self.remaining_label.setText("-00:00")
-        self.waveform.set_amplitudes(None)
+        self._last_elapsed_s = -1
+        self._last_remaining_s = -1
+        self.waveform.set_full_envelope(None)
 
     def next_track(self):
         count = self.playlist.count()
@@ -434,7 +838,21 @@ class GhostPlayerUI(QWidget):
             return
         cur = self.playlist.currentRow()
         if self.shuffle:
-            nxt = random.randint(0, count-1)
+            if len(self._shuffle_order) != count:
+                self._reshuffle()
+            if not 0 <= cur < count:
+                # no current row (e.g. playlist just reloaded): start at the top of the cycle
+                self._shuffle_pos = 0
+            else:
+                # re-anchor if the user picked a track by hand since the last step
+                if self._shuffle_order[self._shuffle_pos] != cur:
+                    self._shuffle_pos = self._shuffle_order.index(cur)
+                self._shuffle_pos += 1
+                if self._shuffle_pos >= count:
+                    # cycle done: fresh order, current track first, continue after it
+                    self._reshuffle()
+                    self._shuffle_pos = min(1, count - 1)
+            nxt = self._shuffle_order[self._shuffle_pos]
         else:
             nxt = cur + 1
             if nxt >= count:
@@ -458,9 +876,24 @@ class GhostPlayerUI(QWidget):
         self.playlist.setCurrentRow(cur - 1)
         self.play()
 
+    def _reshuffle(self):
+        # new random permutation; current track goes first so it isn't replayed
+        self._shuffle_order = list(range(self.playlist.count()))
+        random.shuffle(self._shuffle_order)
+        cur = self.playlist.currentRow()
+        if 0 <= cur < len(self._shuffle_order):
+            i = self._shuffle_order.index(cur)
+            self._shuffle_order[0], self._shuffle_order[i] = self._shuffle_order[i], self._shuffle_order[0]
+        self._shuffle_pos = 0
+
+    def _on_playlist_changed(self, *args):
+        if self.shuffle:
+            self._reshuffle()
+
     def toggle_shuffle(self):
         self.shuffle = not self.shuffle
         if self.shuffle:
+            self._reshuffle()
             self.shuffle_btn.setStyleSheet("background-color: #004400; color: #00FF00; border: 1px solid #00FF00;")
         else:
             self.shuffle_btn.setStyleSheet("background-color: #000000; color: #00FF00; border: 1px solid #00FF00;")
@@ -480,18 +913,37 @@ class GhostPlayerUI(QWidget):
         v = self.volume_slider.value() / 100.0
         self.backend.set_volume(v)
 
+    def _on_slider_moved(self, value):
+        # throttle, not debounce: don't restart a pending timer, so a continuous
+        # drag still seeks every 80 ms (_do_seek reads the latest slider value)
+        if not self._seek_timer.isActive():
+            self._seek_timer.start()
+
     def seek_from_slider(self):
+        self._seek_timer.stop()
+        self._do_seek()
+
+    def _do_seek(self):
         if not self.current_file or self.track_duration <= 0:
             return
         pos = (self.scrub_slider.value() / 1000.0) * self.track_duration
+        if self._state == 'stopped' and self.envelope is not None:
+            # stop() cleared the widget; playback is about to resume
+            self.waveform.set_full_envelope(self.envelope)
         try:
-            self.backend.play(pos)
+            self.backend.set_pos(pos)
         except Exception:
+            # restarting playback, so the state flag has to follow
             try:
-                self.backend.load(self.current_file)
                 self.backend.play(pos)
+                self._state = 'playing'
             except Exception:
-                pass
+                try:
+                    self.backend.load(self.current_file)
+                    self.backend.play(pos)
+                    self._state = 'playing'
+                except Exception:
+                    pass
         self.timer.start()
 
     # UI updates & waveform
@@ -500,54 +952,63 @@ class GhostPlayerUI(QWidget):
         if pos_ms < 0:
             # finished or not playing
             self.timer.stop()
+            self._state = 'stopped'
             if self.repeat_mode == 'one':
                 self.play()
             elif self.repeat_mode == 'all':
                 self.next_track()
             return
+        # nothing on screen to update; the tick above still handles track end
+        if self.isMinimized() or not self.waveform.isVisible():
+            return
 
         elapsed = pos_ms / 1000.0
         if self.track_duration:
             remaining = max(0.0, self.track_duration - elapsed)
-            self.elapsed_label.setText(self._fmt_time(elapsed))
-            self.remaining_label.setText("-" + self._fmt_time(remaining))
+            # labels only change once a second; skip setText otherwise
+            el_s = int(elapsed)
+            if el_s != self._last_elapsed_s:
+                self._last_elapsed_s = el_s
+                self.elapsed_label.setText(self._fmt_time(el_s))
+            rem_s = int(remaining)
+            if rem_s != self._last_remaining_s:
+                self._last_remaining_s = rem_s
+                self.remaining_label.setText("-" + self._fmt_time(rem_s))
             val = int((elapsed / self.track_duration) * 1000)
-            self.scrub_slider.blockSignals(True)
-            self.scrub_slider.setValue(val)
-            self.scrub_slider.blockSignals(False)
+            if val != self.scrub_slider.value() and not self.scrub_slider.isSliderDown():
+                self.scrub_slider.blockSignals(True)
+                self.scrub_slider.setValue(val)
+                self.scrub_slider.blockSignals(False)
 
-        # waveform slice
-        if self.samples is not None and self.track_duration > 0:
-            try:
-                sr = int(len(self.samples) / self.track_duration)
-                center_idx = int(elapsed * sr)
-                half = int(0.1 * sr)
-                start = max(0, center_idx - half)
-                end = min(len(self.samples), center_idx + half)
-                window = self.samples[start:end]
-                if window.size > 0:
-                    chunk = np.abs(window)
-                    self.waveform.set_amplitudes(chunk)
-                else:
-                    self.waveform.set_amplitudes(None)
-            except Exception:
-                self.waveform.set_amplitudes(None)
+        # waveform: cached track pixmap, only the playhead moves
+        if self.envelope is not None and self.track_duration > 0:
+            self.waveform.set_progress(elapsed / self.track_duration)
 
     def _fmt_time(self, secs):
-        m = int(secs // 60)
-        s = int(secs % 60)
-        return f"{m:02}:{s:02}"
+        return _fmt_secs(int(secs))
+
+    # while hidden the timer only has to notice the end of a track
+    def hideEvent(self, event):
+        self.timer.setInterval(1000)
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.timer.setInterval(300)
+        if self._state == 'playing':
+            self._update_time_and_visual()
 
     # keyboard shortcuts
     def keyPressEvent(self, event):
         key = event.key()
         if key == Qt.Key_Space:
-            try:
-                if pygame.mixer.music.get_busy():
-                    self.pause()
-                else:
-                    self.play()
-            except Exception:
+            if self._state == 'playing':
+                self.pause()
+            elif self._state == 'paused':
+                self.backend.unpause()
+                self._state = 'playing'
+                self.timer.start()
+            else:
                 self.play()
         elif key == Qt.Key_Right:
             self.next_track()